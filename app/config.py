@@ -1,5 +1,6 @@
 from pydantic_settings import BaseSettings
 from functools import lru_cache
+import os
 
 
 class Settings(BaseSettings):
@@ -7,6 +8,7 @@ class Settings(BaseSettings):
     ANTHROPIC_API_KEY: str = ""
 
     EMBEDDING_MODEL: str = "sentence-transformers/all-MiniLM-L6-v2"
+    EMBEDDING_BACKEND: str = "st"  # Options: 'st', 'onnx'
     LLM_MODEL: str = "gpt-5-mini"
     LLM_PROVIDER: str = "openai"  # Options: 'openai', 'anthropic'
 
@@ -15,6 +17,22 @@ class Settings(BaseSettings):
 
     COLLECTION_NAME: str = "documents"
     VECTOR_DB_PATH: str = "./chroma_db"
+    CHROMA_BATCH_SIZE: int = 256
+
+    # 'persistent' embeds Chroma in-process (dev, single worker);
+    # 'http' talks to a Chroma server so multiple uvicorn workers share
+    # one index instead of each opening the SQLite file.
+    CHROMA_MODE: str = "persistent"  # Options: 'persistent', 'http'
+    CHROMA_HOST: str = "localhost"
+    CHROMA_PORT: int = 8000
+
+    # HNSW index tuning. Higher M/ef_construction build a denser graph
+    # (larger index, better recall); ef_search trades query latency for
+    # recall at search time.
+    HNSW_M: int = 32
+    HNSW_EF_CONSTRUCTION: int = 200
+    HNSW_EF_SEARCH: int = 64
+    HNSW_NUM_THREADS: int = os.cpu_count() or 4
 
     TOP_K_RESULTS: int = 3
 
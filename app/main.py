@@ -1,8 +1,12 @@
-from fastapi import FastAPI, File, UploadFile, HTTPException, Depends
+from fastapi import FastAPI, File, Request, UploadFile, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from typing import List
+import aiofiles
+import asyncio
 import os
-import shutil
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timezone
 
 from app.config import get_settings, Settings
@@ -25,22 +29,50 @@ vector_store = None
 llm_service = None
 document_processor = None
 
+# Micro-batch sizes for the upload pipeline: chunks are embedded in small
+# batches so upserts can start early, then coalesced into larger batches
+# before being written to the vector store.
+EMBED_BATCH_SIZE = 32
+UPSERT_BATCH_SIZE = 256
+
+# Bounded queues give backpressure so a fast stage cannot run far ahead of
+# a slow one and pile up chunks in memory.
+PIPELINE_QUEUE_SIZE = 4
+
+ALLOWED_EXTENSIONS = frozenset({".pdf", ".txt", ".docx", ".doc"})
+
+
+def _make_vector_store(settings: Settings) -> VectorStore:
+    return VectorStore(
+        persist_directory=settings.VECTOR_DB_PATH,
+        collection_name=settings.COLLECTION_NAME,
+        batch_size=settings.CHROMA_BATCH_SIZE,
+        hnsw_m=settings.HNSW_M,
+        hnsw_ef_construction=settings.HNSW_EF_CONSTRUCTION,
+        hnsw_ef_search=settings.HNSW_EF_SEARCH,
+        hnsw_num_threads=settings.HNSW_NUM_THREADS,
+        mode=settings.CHROMA_MODE,
+        host=settings.CHROMA_HOST,
+        port=settings.CHROMA_PORT,
+    )
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     global embedding_service, vector_store, llm_service, document_processor
+    # Resolve settings once and stash them on app.state; handlers read
+    # them from there instead of paying dependency resolution per request.
     settings = get_settings()
+    app.state.settings = settings
 
     print("Starting up and initializing services...")
 
     embedding_service = EmbeddingService(
-        model_name=settings.EMBEDDING_MODEL
+        model_name=settings.EMBEDDING_MODEL,
+        backend=settings.EMBEDDING_BACKEND,
     )
 
-    vector_store = VectorStore(
-        persist_directory=settings.VECTOR_DB_PATH,
-        collection_name=settings.COLLECTION_NAME,
-    )
+    vector_store = _make_vector_store(settings)
 
     document_processor = DocumentProcessor(
         chunk_size=settings.CHUNK_SIZE, chunk_overlap=settings.CHUNK_OVERLAP
@@ -58,12 +90,22 @@ async def lifespan(app: FastAPI):
         api_key=api_key,
     )
 
+    # Document parsing is CPU-bound (and GIL-bound on the pypdf fallback);
+    # a process pool lets concurrent uploads parse on separate cores.
+    app.state.parse_pool = ProcessPoolExecutor(max_workers=os.cpu_count())
+
     print("All services initialized successfully.")
     yield
     print("Shutting down...")
+    app.state.parse_pool.shutdown()
 
 
-app = FastAPI(title="RAG API", version="1.0.0", lifespan=lifespan)
+app = FastAPI(
+    title="RAG API",
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
+)
 
 app.add_middleware(
     CORSMiddleware,
@@ -89,7 +131,7 @@ async def read_root():
 
 @app.get("/health", response_model=HealthResponse)
 async def health_check():
-    stats = vector_store.get_collection_stats()
+    stats = await vector_store.aget_collection_stats()
     return HealthResponse(
         status="healthy",
         vector_db_status="connected",
@@ -98,17 +140,13 @@ async def health_check():
 
 
 @app.post("/documents/upload", response_model=DocumentUploadResponse)
-async def upload_document(
-    file: UploadFile = File(...),
-    settings: Settings = Depends(get_settings),
-):
-    allowed_extensions = {".pdf", ".txt", ".docx", ".doc"}
+async def upload_document(request: Request, file: UploadFile = File(...)):
     file_extension = os.path.splitext(file.filename)[1].lower()
 
-    if file_extension not in allowed_extensions:
+    if file_extension not in ALLOWED_EXTENSIONS:
         raise HTTPException(
             status_code=400,
-            detail=f"Unsupported file type: {file_extension}. Allowed types are: {', '.join(allowed_extensions)}",
+            detail=f"Unsupported file type: {file_extension}. Allowed types are: {', '.join(ALLOWED_EXTENSIONS)}",
         )
 
     os.makedirs("data/documents", exist_ok=True)
@@ -116,8 +154,11 @@ async def upload_document(
     file_path = f"data/documents/{file.filename}"
 
     try:
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
+        # Stream to disk in 1 MiB chunks so large uploads never block the
+        # event loop on a single long write.
+        async with aiofiles.open(file_path, "wb") as buffer:
+            while chunk := await file.read(1 << 20):
+                await buffer.write(chunk)
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -126,31 +167,91 @@ async def upload_document(
 
     try:
         print(f"Processing document: {file.filename}")
-        chunks = document_processor.process_document(file_path)
-        print(f"Document processed into {len(chunks)} chunks.")
-
-        print("Generating embeddings for chunks...")
-        embeddings = embedding_service.embed_batch(chunks)
-        print(f"Created {len(embeddings)} embeddings.")
-
-        metadata = [
-            {
-                "source": file.filename,
-                "chunk_id": idx,
-                "uploaded_at": datetime.now(timezone.utc).isoformat(),
-            }
-            for idx in range(len(chunks))
+
+        # Three-stage async pipeline: load/split -> embed -> upsert. Each
+        # stage hands micro-batches to the next through a bounded queue, so
+        # embedding of early chunks overlaps parsing of the rest, and vector
+        # store writes overlap embedding. A None sentinel closes each stage.
+        embed_q: asyncio.Queue = asyncio.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+        upsert_q: asyncio.Queue = asyncio.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+        doc_ids: List[str] = []
+
+        # One timestamp per upload; formatting it per chunk just repeats
+        # the same value a thousand times for a large document.
+        uploaded_at = datetime.now(timezone.utc).isoformat()
+
+        async def producer() -> int:
+            loop = asyncio.get_running_loop()
+            chunks = await loop.run_in_executor(
+                request.app.state.parse_pool,
+                document_processor.process_document,
+                file_path,
+            )
+            print(f"Document processed into {len(chunks)} chunks.")
+            for offset in range(0, len(chunks), EMBED_BATCH_SIZE):
+                batch = chunks[offset : offset + EMBED_BATCH_SIZE]
+                await embed_q.put((offset, batch))
+            await embed_q.put(None)
+            return len(chunks)
+
+        async def embedder():
+            while (item := await embed_q.get()) is not None:
+                offset, texts = item
+                embeddings = await embedding_service.aembed_batch(texts)
+                await upsert_q.put((offset, texts, embeddings))
+            await upsert_q.put(None)
+
+        async def writer():
+            pending_texts: List[str] = []
+            pending_embeddings: List[np.ndarray] = []
+            pending_metadata: List[dict] = []
+
+            async def flush():
+                if not pending_texts:
+                    return
+                ids = await vector_store.aadd_documents(
+                    texts=list(pending_texts),
+                    embeddings=np.stack(pending_embeddings),
+                    metadata=list(pending_metadata),
+                )
+                doc_ids.extend(ids)
+                pending_texts.clear()
+                pending_embeddings.clear()
+                pending_metadata.clear()
+
+            while (item := await upsert_q.get()) is not None:
+                offset, texts, embeddings = item
+                pending_texts.extend(texts)
+                pending_embeddings.extend(embeddings)
+                pending_metadata.extend(
+                    {
+                        "source": file.filename,
+                        "chunk_id": offset + idx,
+                        "uploaded_at": uploaded_at,
+                    }
+                    for idx in range(len(texts))
+                )
+                if len(pending_texts) >= UPSERT_BATCH_SIZE:
+                    await flush()
+            await flush()
+
+        tasks = [
+            asyncio.create_task(producer()),
+            asyncio.create_task(embedder()),
+            asyncio.create_task(writer()),
         ]
+        try:
+            chunks_created, _, _ = await asyncio.gather(*tasks)
+        except Exception:
+            for task in tasks:
+                task.cancel()
+            raise
 
-        print("Adding documents to vector db...")
-        doc_ids = vector_store.add_documents(
-            texts=chunks, embeddings=embeddings, metadata=metadata
-        )
         print(f"Added {len(doc_ids)} documents to vector store.")
 
         return DocumentUploadResponse(
             file_name=file.filename,
-            chunks_created=len(chunks),
+            chunks_created=chunks_created,
             document_id=file.filename,
             message="Document uploaded and processed successfully.",
         )
@@ -161,18 +262,21 @@ async def upload_document(
 
 
 @app.post("/query", response_model=QueryResponse)
-async def query_documents(
-    query_request: QueryRequest,
-    settings: Settings = Depends(get_settings),
-):
+async def query_documents(query_request: QueryRequest, request: Request):
+    settings = request.app.state.settings
     try:
         print(f"Processing query: {query_request.question}")
-        query_embedding = embedding_service.embed_text(query_request.question)
+        # Kick off the embedding immediately; it runs on a worker thread
+        # while the request parameters are resolved.
+        embedding_task = asyncio.create_task(
+            embedding_service.aembed_text(query_request.question)
+        )
 
         top_k = query_request.top_k or settings.TOP_K_RESULTS
+        query_embedding = await embedding_task
 
-        print("Searching for {top_k} relevant chunks...")
-        search_results = vector_store.search(
+        print(f"Searching for {top_k} relevant chunks...")
+        search_results = await vector_store.asearch(
             query_embedding=query_embedding, top_k=top_k
         )
 
@@ -188,7 +292,7 @@ async def query_documents(
 
         print("Generating answer from LLM...")
 
-        answer = llm_service.generate_answer(
+        answer = await llm_service.agenerate_answer(
             question=query_request.question,
             context_chunks=retrieved_chunks,
         )
@@ -213,14 +317,12 @@ async def query_documents(
 
 
 @app.delete("/documents/clear", response_model=dict)
-async def clear_documents(settings: Settings = Depends(get_settings)):
+async def clear_documents(request: Request):
     global vector_store
+    settings = request.app.state.settings
     try:
         vector_store.delete_collection()
-        vector_store = VectorStore(
-            persist_directory=settings.VECTOR_DB_PATH,
-            collection_name=settings.COLLECTION_NAME,
-        )
+        vector_store = _make_vector_store(settings)
         return {"message": "All documents cleared successfully."}
     except Exception as e:
         raise HTTPException(
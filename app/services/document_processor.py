@@ -4,11 +4,24 @@ from langchain.text_splitter import RecursiveCharacterTextSplitter
 from langchain_community.document_loaders import PyPDFLoader, TextLoader
 from langchain_community.document_loaders.word_document import Docx2txtLoader
 
+try:
+    # PDFium extracts text in native code (5-20x faster than pypdf and
+    # releases the GIL); fall back to PyPDFLoader when unavailable.
+    import pypdfium2 as pdfium
+except ImportError:
+    pdfium = None
+
 
 class DocumentProcessor:
-    def __init__(self, chunk_size: int = 1000, chunk_overlap: int = 200):
+    def __init__(
+        self,
+        chunk_size: int = 1000,
+        chunk_overlap: int = 200,
+        use_fast_chunker: bool = True,
+    ):
         self.chunk_size = chunk_size
         self.chunk_overlap = chunk_overlap
+        self.use_fast_chunker = use_fast_chunker
 
         self.text_splitter = RecursiveCharacterTextSplitter(
             chunk_size=chunk_size,
@@ -17,9 +30,24 @@ class DocumentProcessor:
             separators=["\n\n", "\n", " ", ""],
         )
 
+    def _load_pdf_pages(self, file_path: str) -> List[str]:
+        pdf = pdfium.PdfDocument(file_path)
+        try:
+            pages = []
+            for page in pdf:
+                textpage = page.get_textpage()
+                pages.append(textpage.get_text_bounded())
+                textpage.close()
+                page.close()
+            return pages
+        finally:
+            pdf.close()
+
     def load_document(self, file_path: str) -> List[str]:
         file_extension = os.path.splitext(file_path)[1].lower()
         if file_extension == ".pdf":
+            if pdfium is not None:
+                return self._load_pdf_pages(file_path)
             loader = PyPDFLoader(file_path)
         elif file_extension in [".txt", ".md"]:
             loader = TextLoader(file_path, encoding="utf-8")
@@ -31,12 +59,40 @@ class DocumentProcessor:
         documents = loader.load()
         return [doc.page_content for doc in documents]
 
+    def _fast_chunk(self, text: str) -> List[str]:
+        # Fixed-stride windowing: chunks are plain slices at
+        # (chunk_size - chunk_overlap) intervals, with each start snapped
+        # to a nearby paragraph break when one exists. Slicing happens at
+        # C level, so this is an order of magnitude faster than the
+        # recursive splitter's separator walk.
+        n = len(text)
+        if n <= self.chunk_size:
+            return [text] if text.strip() else []
+
+        stride = max(1, self.chunk_size - self.chunk_overlap)
+        chunks = []
+        for start in range(0, n - self.chunk_overlap, stride):
+            if start > 0:
+                snap = text.rfind("\n\n", start - 100, start + 100)
+                if snap != -1:
+                    start = snap + 2
+            chunk = text[start : start + self.chunk_size]
+            if chunk.strip():
+                chunks.append(chunk)
+        return chunks
+
     def chunk_text(self, text: str) -> List[str]:
+        if self.use_fast_chunker:
+            return self._fast_chunk(text)
         chunks = self.text_splitter.split_text(text)
         return chunks
 
     def process_document(self, file_path: str) -> List[str]:
-        pages = self.load_document(file_path)
-        full_text = "\n\n".join(pages)
-        chunks = self.chunk_text(full_text)
+        # Split page by page instead of joining everything into one large
+        # string first: avoids a multi-MB allocation on big documents and
+        # keeps chunk boundaries page-aligned, which also gives cleaner
+        # source attribution.
+        chunks: List[str] = []
+        for page_text in self.load_document(file_path):
+            chunks.extend(self.chunk_text(page_text))
         return chunks
@@ -1,35 +1,199 @@
-from sentence_transformers import SentenceTransformer
+from collections import OrderedDict
 from typing import List
+import asyncio
+import hashlib
+import threading
 import numpy as np
 
 
 class EmbeddingService:
     def __init__(
-        self, model_name: str = "sentence-transformers/all-MiniLM-L6-v2"
+        self,
+        model_name: str = "sentence-transformers/all-MiniLM-L6-v2",
+        backend: str = "st",
+        cache_size: int = 100_000,
     ):
-        print(f"Loading embedding model: {model_name}")
-        self.model = SentenceTransformer(model_name)
-        self.embedding_dimension = (
-            self.model.get_sentence_embedding_dimension()
+        self.backend = backend.lower()
+
+        # LRU cache of text-hash -> embedding, so boilerplate chunks that
+        # repeat across documents (headers, footers, TOCs) and retried
+        # uploads are never re-encoded. Guarded by a lock because encoding
+        # runs on worker threads.
+        self.cache_size = cache_size
+        self._cache: OrderedDict = OrderedDict()
+        self._cache_lock = threading.Lock()
+        print(
+            f"Loading embedding model: {model_name} (backend={self.backend})"
         )
+
+        if self.backend == "st":
+            import torch
+            from sentence_transformers import SentenceTransformer
+
+            device = "cuda" if torch.cuda.is_available() else "cpu"
+            self.model = SentenceTransformer(model_name, device=device)
+            if device == "cuda":
+                # FP16 weights halve memory traffic and roughly double
+                # encode throughput; MiniLM is robust to half precision.
+                # TF32 covers any ops that stay in float32.
+                self.model.half()
+                torch.backends.cuda.matmul.allow_tf32 = True
+                torch.set_float32_matmul_precision("high")
+            print(f"Embedding model running on {device}")
+            self.embedding_dimension = (
+                self.model.get_sentence_embedding_dimension()
+            )
+        elif self.backend == "onnx":
+            # ONNX Runtime path: the transformer runs through optimized
+            # fused kernels instead of PyTorch eager mode, which is much
+            # faster for small encoders on CPU. Requires the optional
+            # optimum[onnxruntime] dependency.
+            try:
+                from optimum.onnxruntime import ORTModelForFeatureExtraction
+                from transformers import AutoTokenizer
+            except ImportError as e:
+                raise ImportError(
+                    "The 'onnx' embedding backend requires "
+                    "optimum[onnxruntime]; install it or use backend='st'."
+                ) from e
+
+            self.tokenizer = AutoTokenizer.from_pretrained(model_name)
+            self.model = ORTModelForFeatureExtraction.from_pretrained(
+                model_name, export=True
+            )
+            self.embedding_dimension = self.model.config.hidden_size
+        else:
+            raise ValueError(f"Unsupported embedding backend: {backend}")
+
         print(
             f"Model loaded with embedding dimension: {self.embedding_dimension}"
         )
 
+    def _encode(
+        self, texts: List[str], batch_size: int = 32
+    ) -> np.ndarray:
+        if not texts:
+            return np.empty(
+                (0, self.embedding_dimension), dtype=np.float32
+            )
+
+        keys = [
+            hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+            for text in texts
+        ]
+
+        rows: List[np.ndarray] = [None] * len(texts)
+        misses: List[int] = []
+        with self._cache_lock:
+            for i, key in enumerate(keys):
+                cached = self._cache.get(key)
+                if cached is not None:
+                    self._cache.move_to_end(key)
+                    rows[i] = cached
+                else:
+                    misses.append(i)
+
+        if misses:
+            encoded = np.asarray(
+                self._encode_uncached(
+                    [texts[i] for i in misses], batch_size=batch_size
+                ),
+                dtype=np.float32,
+            )
+            with self._cache_lock:
+                for i, embedding in zip(misses, encoded):
+                    rows[i] = embedding
+                    self._cache[keys[i]] = embedding
+                    self._cache.move_to_end(keys[i])
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+
+        return np.stack(rows)
+
+    def _encode_uncached(
+        self, texts: List[str], batch_size: int = 32
+    ) -> np.ndarray:
+        # Embeddings are unit-normalized so the vector store can use the
+        # cheaper inner-product space (dot == cosine on unit vectors).
+        if self.backend == "st":
+            return self.model.encode(
+                texts,
+                batch_size=batch_size,
+                convert_to_numpy=True,
+                normalize_embeddings=True,
+            )
+
+        embeddings = []
+        for i in range(0, len(texts), batch_size):
+            batch = texts[i : i + batch_size]
+            inputs = self.tokenizer(
+                batch,
+                padding=True,
+                truncation=True,
+                return_tensors="np",
+            )
+            token_embeddings = self.model(**inputs).last_hidden_state
+            # Mean pooling over non-padding tokens, matching what
+            # sentence-transformers does for this model family.
+            mask = inputs["attention_mask"][..., None].astype(
+                token_embeddings.dtype
+            )
+            summed = (token_embeddings * mask).sum(axis=1)
+            counts = np.clip(mask.sum(axis=1), 1e-9, None)
+            pooled = summed / counts
+            norms = np.clip(
+                np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None
+            )
+            embeddings.append(pooled / norms)
+        return np.concatenate(embeddings, axis=0)
+
     def embed_text(self, text: str) -> List[float]:
-        embedding = self.model.encode(text, convert_to_numpy=True)
+        embedding = self._encode([text])[0]
         return embedding.tolist()
 
+    async def aembed_text(self, text: str) -> List[float]:
+        return await asyncio.to_thread(self.embed_text, text)
+
     def embed_batch(
         self, texts: List[str], batch_size: int = 32
-    ) -> List[List[float]]:
-        embeddings = self.model.encode(
-            texts,
-            batch_size=batch_size,
-            convert_to_numpy=True,
-            show_progress_bar=True,
+    ) -> np.ndarray:
+        # One contiguous (N, dim) float32 array: N lists of Python floats
+        # would cost ~7x the memory of the raw tensor and force Chroma to
+        # convert them back anyway.
+        return self._encode(texts, batch_size=batch_size)
+
+    async def aembed_batch(
+        self,
+        texts: List[str],
+        batch_size: int = 32,
+        concurrency: int = 8,
+    ) -> np.ndarray:
+        # Sort by length so each sub-batch holds similarly sized texts and
+        # wastes less work on padding, then slice into sub-batches encoded
+        # concurrently. Original order is restored via the carried indices.
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+        sub_batches = [
+            order[i : i + batch_size]
+            for i in range(0, len(order), batch_size)
+        ]
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def _one(indices: List[int]) -> np.ndarray:
+            async with semaphore:
+                return await asyncio.to_thread(
+                    self._encode,
+                    [texts[i] for i in indices],
+                )
+
+        results = await asyncio.gather(*[_one(sb) for sb in sub_batches])
+
+        embeddings = np.empty(
+            (len(texts), self.embedding_dimension), dtype=np.float32
         )
-        return embeddings.tolist()
+        for indices, batch_embeddings in zip(sub_batches, results):
+            embeddings[indices] = batch_embeddings
+        return embeddings
 
     def get_embedding_dimension(self) -> int:
         return self.embedding_dimension
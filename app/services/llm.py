@@ -1,6 +1,6 @@
 from typing import List, Dict, Any, Union
-from openai import OpenAI
-from anthropic import Anthropic
+from openai import AsyncOpenAI
+from anthropic import AsyncAnthropic
 
 
 def _extract_openai_content(message: Any, content: Any) -> str:
@@ -41,6 +41,18 @@ def _extract_openai_content(message: Any, content: Any) -> str:
 
 
 class LLMService:
+    _SYSTEM_PROMPT = (
+        "You are a helpful assistant that answers questions based only on "
+        "the provided context."
+    )
+
+    _USER_PROMPT_TMPL = (
+        "Answer the question based only on the following context. "
+        "If the answer is not in the context, say "
+        '"I don\'t have enough information to answer this question."'
+        "\n\nContext:{context}\n\nQuestion: {question}\nAnswer:"
+    )
+
     def __init__(
         self,
         provider: str = "openai",
@@ -52,39 +64,32 @@ class LLMService:
         self.model = model
 
         if self.provider == "openai":
-            self.client = OpenAI(api_key=api_key)
+            self.client = AsyncOpenAI(api_key=api_key)
         elif self.provider == "anthropic":
-            self.client = Anthropic(api_key=api_key)
+            self.client = AsyncAnthropic(api_key=api_key)
         else:
             raise ValueError(f"Unsupported LLM provider {provider}")
 
-    def generate_answer(
+    async def agenerate_answer(
         self, question: str, context_chunks: List[str], max_tokens: int = 500
     ) -> str:
+        # Generator into join: no intermediate list of formatted strings.
         context = "\n\n".join(
-            [
-                f"Context {i+1}:{chunk}"
-                for i, chunk in enumerate(context_chunks)
-            ]
+            f"Context {i + 1}: {chunk}"
+            for i, chunk in enumerate(context_chunks)
         )
 
-        prompt = f"""Answer the question based only on the following context. 
-        If the answer is not in the context, say 
-        "I don't have enough information to answer this question."
-
-        Context:{context}
-
-        Question: {question}
-        Answer:
-        """
+        prompt = self._USER_PROMPT_TMPL.format_map(
+            {"context": context, "question": question}
+        )
 
         if self.provider == "openai":
-            response = self.client.chat.completions.create(
+            response = await self.client.chat.completions.create(
                 model=self.model,
                 messages=[
                     {
                         "role": "system",
-                        "content": "You are a helpful assistant that answers questions based only on the provided context.",
+                        "content": self._SYSTEM_PROMPT,
                     },
                     {"role": "user", "content": prompt},
                 ],
@@ -117,7 +122,7 @@ class LLMService:
             return answer
 
         elif self.provider == "anthropic":
-            response = self.client.messages.create(
+            response = await self.client.messages.create(
                 model=self.model,
                 max_tokens=max_tokens,
                 temperature=0.3,
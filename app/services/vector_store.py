@@ -1,7 +1,23 @@
 import chromadb
 from chromadb.config import Settings
-from typing import List, Dict, Any, Optional
-import uuid
+from typing import List, Dict, Any, Optional, Union
+import asyncio
+import binascii
+import hashlib
+import os
+import numpy as np
+
+
+def _content_id(source: Any, chunk_id: Any, text: str) -> str:
+    """Deterministic chunk id: same source/position/content -> same id."""
+    key = f"{source}|{chunk_id}|{text}".encode("utf-8")
+    return hashlib.blake2b(key, digest_size=16).hexdigest()
+
+
+def _random_ids(n: int) -> List[str]:
+    """n random 32-hex-char ids from one urandom read and one hexlify."""
+    hex_blob = binascii.hexlify(os.urandom(16 * n)).decode("ascii")
+    return [hex_blob[i * 32 : (i + 1) * 32] for i in range(n)]
 
 
 class VectorStore:
@@ -9,30 +25,108 @@ class VectorStore:
         self,
         persist_directory: str = "./chroma_db",
         collection_name: str = "documents",
+        batch_size: int = 256,
+        hnsw_m: int = 32,
+        hnsw_ef_construction: int = 200,
+        hnsw_ef_search: int = 64,
+        hnsw_num_threads: Optional[int] = None,
+        mode: str = "persistent",
+        host: str = "localhost",
+        port: int = 8000,
     ):
-        self.client = chromadb.PersistentClient(
-            path=persist_directory,
-            settings=Settings(anonymized_telemetry=False),
-        )
+        mode = mode.lower()
+        if mode == "persistent":
+            self.client = chromadb.PersistentClient(
+                path=persist_directory,
+                settings=Settings(anonymized_telemetry=False),
+            )
+        elif mode == "http":
+            # Sidecar Chroma server: every uvicorn worker shares one index
+            # over keep-alive connections instead of opening its own
+            # SQLite handle and HNSW cache.
+            self.client = chromadb.HttpClient(
+                host=host,
+                port=port,
+                settings=Settings(anonymized_telemetry=False),
+            )
+        else:
+            raise ValueError(f"Unsupported Chroma mode: {mode}")
 
+        # Inner product instead of cosine: embeddings arrive unit-normalized
+        # from EmbeddingService, so ip gives the same ranking without the
+        # per-comparison norm work. The hnsw:* knobs only apply at
+        # collection creation; existing collections must be cleared
+        # (/documents/clear) before any of this takes effect.
         self.collection = self.client.get_or_create_collection(
-            name=collection_name, metadata={"hnsw:space": "cosine"}
+            name=collection_name,
+            metadata={
+                "hnsw:space": "ip",
+                "hnsw:M": hnsw_m,
+                "hnsw:construction_ef": hnsw_ef_construction,
+                "hnsw:search_ef": hnsw_ef_search,
+                "hnsw:num_threads": hnsw_num_threads or os.cpu_count() or 4,
+            },
         )
 
         self.collection_name = collection_name
+        self.batch_size = batch_size
+
+        # Serialize writes from concurrent uploads; reads are safe to run
+        # concurrently against the HNSW index.
+        self._write_lock = asyncio.Lock()
 
     def add_documents(
         self,
         texts: List[str],
-        embeddings: List[List[float]],
+        embeddings: Union[np.ndarray, List[List[float]]],
         metadata: List[Dict[str, Any]],
+        upsert: bool = True,
     ) -> List[str]:
-        ids = [str(uuid.uuid4()) for _ in range(len(texts))]
-        self.collection.add(
-            ids=ids, embeddings=embeddings, metadatas=metadata, documents=texts
+        # Content-hash ids are cheaper than uuid4 (no entropy-pool reads)
+        # and make re-uploads idempotent: the same chunk hashes to the same
+        # id, so upserting it again is a no-op instead of a duplicate row.
+        # Metadata without source/chunk_id falls back to random ids drawn
+        # from a single urandom read rather than one RNG call per chunk.
+        n_random = sum(
+            1
+            for meta in metadata
+            if "source" not in meta or "chunk_id" not in meta
         )
+        random_ids = iter(_random_ids(n_random)) if n_random else iter(())
+        ids = [
+            _content_id(meta["source"], meta["chunk_id"], text)
+            if "source" in meta and "chunk_id" in meta
+            else next(random_ids)
+            for text, meta in zip(texts, metadata)
+        ]
+        write = self.collection.upsert if upsert else self.collection.add
+        # A contiguous float32 ndarray is passed straight through; slicing
+        # it below is a view, not a copy.
+        if isinstance(embeddings, np.ndarray):
+            embeddings = np.ascontiguousarray(embeddings, dtype=np.float32)
+        # Write in batch_size slices: one oversized call can blow past
+        # Chroma's per-request maximum, and each call pays a fixed
+        # round-trip/index cost that batching amortizes.
+        for i in range(0, len(texts), self.batch_size):
+            write(
+                ids=ids[i : i + self.batch_size],
+                embeddings=embeddings[i : i + self.batch_size],
+                metadatas=metadata[i : i + self.batch_size],
+                documents=texts[i : i + self.batch_size],
+            )
         return ids
 
+    async def aadd_documents(
+        self,
+        texts: List[str],
+        embeddings: Union[np.ndarray, List[List[float]]],
+        metadata: List[Dict[str, Any]],
+    ) -> List[str]:
+        async with self._write_lock:
+            return await asyncio.to_thread(
+                self.add_documents, texts, embeddings, metadata
+            )
+
     def search(
         self, query_embedding: List[float], top_k: int = 3
     ) -> Dict[str, Any]:
@@ -43,6 +137,11 @@ class VectorStore:
         )
         return results
 
+    async def asearch(
+        self, query_embedding: List[float], top_k: int = 3
+    ) -> Dict[str, Any]:
+        return await asyncio.to_thread(self.search, query_embedding, top_k)
+
     def delete_collection(self):
         self.client.delete_collection(name=self.collection_name)
 
@@ -52,3 +151,6 @@ class VectorStore:
             "collection_name": self.collection_name,
             "total_documents": count,
         }
+
+    async def aget_collection_stats(self) -> Dict[str, Any]:
+        return await asyncio.to_thread(self.get_collection_stats)